@@ -2,16 +2,27 @@ import json
 import requests
 from . import pcc_exceptions
 from . import pcc_enums
+from . import pcc_concurrency
+from . import pcc_journal
+from . import pcc_latency
+
+READ_ACTIONS = ("show", "getmember", "getmacro", "getparam", "gettemplate", "gethostgroup", "getcontact",
+                "getcontactgroup")
 
 
 class CentreonAPIv1:
-    def __init__(self, centreon_url, custom_endpoint: str = None):
+    def __init__(self, centreon_url, custom_endpoint: str = None, coalesce_reads: bool = False,
+                 journal: pcc_journal.OperationJournal = None, timeout=None,
+                 hedge_policy: pcc_latency.HedgePolicy = None):
 
         try:
-            status_code = requests.head(f"{centreon_url}").status_code
+            status_code = requests.head(f"{centreon_url}", timeout=timeout).status_code
             if status_code >= 400:
                 raise pcc_exceptions.CentreonConnectionException(f'Centreon server on following URL: '
                                                                  f'"{centreon_url}" returned code {status_code}')
+        except requests.exceptions.Timeout:
+            raise pcc_exceptions.CentreonTimeoutException(f'Centreon server on following URL: '
+                                                          f'"{centreon_url}" did not answer in time')
         except requests.exceptions.ConnectionError:
             raise pcc_exceptions.CentreonConnectionException(f'Failed to request Centreon server on following URL: '
                                                              f'"{centreon_url}"')
@@ -20,6 +31,10 @@ class CentreonAPIv1:
             else custom_endpoint
         self.__v1_server_url = centreon_url
         self.__v1_api_token = None
+        self.__single_flight = pcc_concurrency.SingleFlight() if coalesce_reads else None
+        self.__journal = journal
+        self.__timeout = timeout
+        self.__hedge_policy = hedge_policy
 
     def __check_token(self) -> bool:
         if self.__v1_server_url is None:
@@ -57,14 +72,55 @@ class CentreonAPIv1:
 
         return payload
 
+    @staticmethod
+    def __build_skipped_response() -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "Skipped (already confirmed in journal)"
+        response._content = json.dumps({"result": [], "journal": "skipped"}).encode("utf-8")
+        return response
+
     def __send_request(self, payload: json) -> requests.Response:
+        deadline = pcc_latency.current_deadline()
+        is_read = str(payload.get("action", "")).lower() in READ_ACTIONS
+        if is_read:
+            def read():
+                if self.__hedge_policy is None:
+                    return self.__post_request(payload, deadline)
+                return self.__hedge_policy.call(lambda: self.__post_request(payload, deadline), deadline)
+
+            if self.__single_flight is not None:
+                key = (self.__v1_server_url, self.__endpoint, self.__v1_api_token,
+                       json.dumps(payload, sort_keys=True))
+                return self.__single_flight.do(key, read, deadline)
+            return read()
+
+        if self.__journal is None:
+            return self.__post_request(payload, deadline)
+
+        key = self.__journal.operation_key(payload, self.__v1_server_url)
+        if self.__journal.is_confirmed(key):
+            return self.__build_skipped_response()
+        try:
+            response = self.__post_request(payload, deadline)
+        except pcc_exceptions.CentreonRequestException as e:
+            self.__journal.record(key, False, e.message, payload)
+            raise
+        self.__journal.record(key, True, payload=payload)
+        return response
 
+    def __post_request(self, payload: json, deadline: pcc_latency.Deadline = None) -> requests.Response:
         c_header = {
             "Content-Type": "application/json",
             "centreon-auth-token": self.__v1_api_token
         }
-        response = requests.post(f"{self.__v1_server_url}{self.__endpoint}",
-                                 data=json.dumps(payload), headers=c_header)
+        try:
+            response = requests.post(f"{self.__v1_server_url}{self.__endpoint}",
+                                     data=json.dumps(payload), headers=c_header,
+                                     timeout=pcc_latency.request_timeout(self.__timeout, deadline))
+        except requests.exceptions.Timeout:
+            raise pcc_exceptions.CentreonTimeoutException(f"Centreon APIv1 request timed out: "
+                                                          f"{payload.get('object', '')} {payload['action']}")
         self.__check_api_response(response)
         return response
 
@@ -73,7 +129,9 @@ class CentreonAPIv1:
 
         endpoint = "/centreon/api/index.php?action=authenticate" if custom_endpoint is None else custom_endpoint
         try:
-            response = requests.post(f"{self.__v1_server_url}{endpoint}", data=auth)
+            response = requests.post(f"{self.__v1_server_url}{endpoint}", data=auth, timeout=self.__timeout)
+        except requests.exceptions.Timeout:
+            raise pcc_exceptions.CentreonTimeoutException("Centreon server did not answer in time!")
         except requests.exceptions.ConnectionError:
             raise pcc_exceptions.CentreonConnectionException("Failed to connect to Centreon server!")
 
@@ -88,6 +146,12 @@ class CentreonAPIv1:
     def get_token(self) -> str:
         return self.__v1_api_token
 
+    def get_journal(self) -> pcc_journal.OperationJournal:
+        return self.__journal
+
+    def set_journal(self, journal: pcc_journal.OperationJournal = None):
+        self.__journal = journal
+
     # ==================================
     # HOSTS
     # ==================================
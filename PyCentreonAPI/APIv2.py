@@ -1,23 +1,40 @@
 import json
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from . import pcc_exceptions
+from . import pcc_enums
+from . import pcc_search
+from . import pcc_concurrency
+from . import pcc_resources
+from . import pcc_latency
 
 PAGE_SUB1 = "Page argument cannot be lower than 1!"
+DEFAULT_ACTION_CHUNK_SIZE = 100
+DEFAULT_ACTION_WORKERS = 4
+DEFAULT_RESOURCE_PAGE_SIZE = 500
 
 
 class CentreonAPIv2:
-    def __init__(self, centreon_url):
+    def __init__(self, centreon_url, coalesce_reads: bool = False, timeout=None,
+                 hedge_policy: pcc_latency.HedgePolicy = None):
         try:
-            status_code = requests.head(centreon_url).status_code
+            status_code = requests.head(centreon_url, timeout=timeout).status_code
             if status_code >= 400:
                 raise pcc_exceptions.CentreonConnectionException(f'Centreon server on following URL: '
                                                                  f'"{centreon_url}" returned code {status_code}')
+        except requests.exceptions.Timeout:
+            raise pcc_exceptions.CentreonTimeoutException(f'Centreon server on following URL: '
+                                                          f'"{centreon_url}" did not answer in time')
         except requests.exceptions.ConnectionError:
             raise pcc_exceptions.CentreonConnectionException(f'Failed to request Centreon server on following URL: '
                                                              f'"{centreon_url}"')
 
         self.__v2_server_url = centreon_url
         self.__v2_api_token = None
+        self.__single_flight = pcc_concurrency.SingleFlight() if coalesce_reads else None
+        self.__timeout = timeout
+        self.__hedge_policy = hedge_policy
 
     def __check_token(self) -> bool:
         if self.__v2_server_url is None:
@@ -31,7 +48,9 @@ class CentreonAPIv2:
         auth = {"security": {"credentials": {"login": username, "password": password}}}
         try:
             response = requests.post("{}/centreon/api/beta/login".format(self.__v2_server_url),
-                                     data=json.dumps(auth)).json()
+                                     data=json.dumps(auth), timeout=self.__timeout).json()
+        except requests.exceptions.Timeout:
+            raise pcc_exceptions.CentreonTimeoutException("Centreon server did not answer in time!")
         except requests.exceptions.ConnectionError:
             raise pcc_exceptions.CentreonConnectionException("Failed to connect to Centreon server!")
 
@@ -46,8 +65,218 @@ class CentreonAPIv2:
     def get_token(self) -> str:
         return self.__v2_api_token
 
+    def __get_request(self, path: str, params: dict, verify_ssl: bool,
+                      deadline: pcc_latency.Deadline = None) -> requests.Response:
+        if deadline is None:
+            deadline = pcc_latency.current_deadline()
+
+        def send():
+            try:
+                return requests.get(f"{self.__v2_server_url}/centreon/api/beta{path}",
+                                    headers={"X-AUTH-TOKEN": self.__v2_api_token}, verify=verify_ssl, params=params,
+                                    timeout=pcc_latency.request_timeout(self.__timeout, deadline))
+            except requests.exceptions.Timeout:
+                raise pcc_exceptions.CentreonTimeoutException(f"Centreon APIv2 request timed out: GET {path}")
+
+        def read():
+            if self.__hedge_policy is None:
+                return send()
+            return self.__hedge_policy.call(send, deadline)
+
+        if self.__single_flight is None:
+            return read()
+        key = (self.__v2_server_url, path, self.__v2_api_token, verify_ssl,
+               json.dumps(params, sort_keys=True, default=str))
+        return self.__single_flight.do(key, read, deadline)
+
+    @staticmethod
+    def __check_api_response(api_response: requests.Response) -> bool:
+        if api_response.status_code >= 400:
+            raise pcc_exceptions.CentreonRequestException(
+                f"[HTTP Response {api_response.status_code}] {api_response.content.decode('utf-8')}")
+        return True
+
+    def __post_request(self, path: str, body: dict, verify_ssl: bool,
+                       deadline: pcc_latency.Deadline = None) -> requests.Response:
+        if deadline is None:
+            deadline = pcc_latency.current_deadline()
+        try:
+            response = requests.post(f"{self.__v2_server_url}/centreon/api/beta{path}",
+                                     headers={"X-AUTH-TOKEN": self.__v2_api_token,
+                                              "Content-Type": "application/json"},
+                                     verify=verify_ssl, data=json.dumps(body),
+                                     timeout=pcc_latency.request_timeout(self.__timeout, deadline))
+        except requests.exceptions.Timeout:
+            raise pcc_exceptions.CentreonTimeoutException(f"Centreon APIv2 request timed out: POST {path}")
+        self.__check_api_response(response)
+        return response
+
+    def __run_resource_action(self, path: str, items: list, build_body, chunk_size: int, max_workers: int,
+                              verify_ssl: bool, deadline: float = None) -> list:
+        """Send items in chunks of chunk_size, max_workers chunks at a time
+
+        build_body receives a chunk of items and returns the request body. Returns one
+        ResourceActionResult per item, in input order. Chunks that cannot be sent before
+        the deadline are reported as failed.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size cannot be lower than 1!")
+        if max_workers < 1:
+            raise ValueError("Worker count cannot be lower than 1!")
+
+        # Resolved in the calling thread, worker threads do not see its deadline scope
+        deadline = pcc_latency.resolve_deadline(deadline)
+        items = list(items)
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        def send_chunk(chunk: list) -> list:
+            try:
+                self.__post_request(path, build_body(chunk), verify_ssl, deadline)
+                error = None
+            except (pcc_exceptions.CentreonRequestException, pcc_exceptions.CentreonTimeoutException,
+                    requests.exceptions.RequestException) as e:
+                error = str(e)
+            return [pcc_resources.ResourceActionResult(getattr(item, "resource", item), error is None, error)
+                    for item in chunk]
+
+        if len(chunks) <= 1 or max_workers == 1:
+            chunk_results = [send_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                chunk_results = list(executor.map(send_chunk, chunks))
+
+        return [result for chunk_result in chunk_results for result in chunk_result]
+
+    @staticmethod
+    def __format_datetime(value) -> str:
+        return value.isoformat() if isinstance(value, datetime) else value
+
+    # ==================================
+    # REAL-TIME ACTIONS
+    # ==================================
+
+    def acknowledge_resources(self, resources: list[pcc_resources.MonitoringResource], comment: str,
+                              with_services: bool = False, notify: bool = False, persistent: bool = True,
+                              sticky: bool = True, chunk_size: int = DEFAULT_ACTION_CHUNK_SIZE,
+                              max_workers: int = DEFAULT_ACTION_WORKERS, verify_ssl: bool = True,
+                              deadline: float = None) -> list[pcc_resources.ResourceActionResult]:
+        self.__check_token()
+
+        acknowledgement = {
+            "comment": comment,
+            "with_services": with_services,
+            "is_notify_contacts": notify,
+            "is_persistent_comment": persistent,
+            "is_sticky": sticky,
+        }
+
+        def build_body(chunk):
+            return {"acknowledgement": acknowledgement, "resources": [resource.to_dict() for resource in chunk]}
+
+        return self.__run_resource_action("/monitoring/resources/acknowledge", resources, build_body,
+                                          chunk_size, max_workers, verify_ssl, deadline)
+
+    def schedule_downtime(self, resources: list[pcc_resources.MonitoringResource], comment: str, start_time,
+                          end_time, is_fixed: bool = True, duration: int = None, with_services: bool = False,
+                          chunk_size: int = DEFAULT_ACTION_CHUNK_SIZE, max_workers: int = DEFAULT_ACTION_WORKERS,
+                          verify_ssl: bool = True, deadline: float = None) -> list[pcc_resources.ResourceActionResult]:
+        self.__check_token()
+
+        if not is_fixed and duration is None:
+            raise ValueError("Flexible downtimes need a duration!")
+
+        downtime = {
+            "comment": comment,
+            "start_time": self.__format_datetime(start_time),
+            "end_time": self.__format_datetime(end_time),
+            "is_fixed": is_fixed,
+            "with_services": with_services,
+        }
+        if duration is not None:
+            downtime["duration"] = duration
+
+        def build_body(chunk):
+            return {"downtime": downtime, "resources": [resource.to_dict() for resource in chunk]}
+
+        return self.__run_resource_action("/monitoring/resources/downtime", resources, build_body,
+                                          chunk_size, max_workers, verify_ssl, deadline)
+
+    def submit_results(self, results: list[pcc_resources.CheckResult], chunk_size: int = DEFAULT_ACTION_CHUNK_SIZE,
+                       max_workers: int = DEFAULT_ACTION_WORKERS,
+                       verify_ssl: bool = True, deadline: float = None) -> list[pcc_resources.ResourceActionResult]:
+        self.__check_token()
+
+        def build_body(chunk):
+            return {"resources": [result.to_dict() for result in chunk]}
+
+        return self.__run_resource_action("/monitoring/resources/submit", results, build_body,
+                                          chunk_size, max_workers, verify_ssl, deadline)
+
+    # ==================================
+    # RESOURCE STATUS
+    # ==================================
+
+    @staticmethod
+    def __filter_values(values) -> list:
+        if isinstance(values, (str, pcc_enums.PrintableEnum)):
+            values = [values]
+        return [str(value) for value in values]
+
+    def iter_resource_status(self, search=None, types: list[pcc_enums.ResourceType] = None,
+                             states: list[pcc_enums.ResourceState] = None,
+                             statuses: list[pcc_enums.ResourceStatus] = None, hostgroups: list[str] = None,
+                             pollers: list[str] = None, sort_by=None, limit: int = DEFAULT_RESOURCE_PAGE_SIZE,
+                             verify_ssl: bool = True, deadline: float = None):
+        """Yield a ResourceStatusRecord for every matching resource, fetching pages lazily"""
+        self.__check_token()
+
+        if limit < 1:
+            raise ValueError("Limit cannot be lower than 1!")
+
+        deadline = pcc_latency.resolve_deadline(deadline)
+        params = {"limit": limit}
+        if search is not None:
+            params["search"] = pcc_search.serialize_search(search)
+        if sort_by is not None:
+            params["sort_by"] = pcc_search.serialize_sort(sort_by)
+        # Filters are JSON arrays, e.g. types=["service"]
+        for key, values in (("types", types), ("states", states), ("statuses", statuses),
+                            ("hostgroup_names", hostgroups), ("monitoring_server_names", pollers)):
+            if values is not None:
+                params[key] = json.dumps(self.__filter_values(values))
+
+        page = 1
+        while True:
+            params["page"] = page
+            response = self.__get_request("/monitoring/resources", dict(params), verify_ssl, deadline)
+            self.__check_api_response(response)
+            body = response.json()
+
+            result = body.get("result", [])
+            for item in result:
+                yield pcc_resources.decode_resource_status(item)
+
+            total = body.get("meta", {}).get("total")
+            if len(result) < limit or (total is not None and page * limit >= total):
+                return
+            page += 1
+
+    def get_resource_status(self, search=None, types: list[pcc_enums.ResourceType] = None,
+                            states: list[pcc_enums.ResourceState] = None,
+                            statuses: list[pcc_enums.ResourceStatus] = None, hostgroups: list[str] = None,
+                            pollers: list[str] = None, sort_by=None, limit: int = DEFAULT_RESOURCE_PAGE_SIZE,
+                            verify_ssl: bool = True,
+                            deadline: float = None) -> list[pcc_resources.ResourceStatusRecord]:
+        return list(self.iter_resource_status(search=search, types=types, states=states, statuses=statuses,
+                                              hostgroups=hostgroups, pollers=pollers, sort_by=sort_by,
+                                              limit=limit, verify_ssl=verify_ssl, deadline=deadline))
+
+    # ==================================
+    # MONITORING
+    # ==================================
+
     def get_hosts(self, search, limit: int = None, show_service: bool = None, page: int = None,
-                  verify_ssl: bool = True):
+                  verify_ssl: bool = True, sort_by=None):
         self.__check_token()
 
         params = {}
@@ -61,14 +290,16 @@ class CentreonAPIv2:
                 raise ValueError(PAGE_SUB1)
             params["page"] = page
 
-        params["search"] = search
+        if search is not None:
+            params["search"] = pcc_search.serialize_search(search)
+        if sort_by is not None:
+            params["sort_by"] = pcc_search.serialize_sort(sort_by)
 
-        result = requests.get(f"{self.__v2_server_url}/centreon/api/beta/monitoring/hosts",
-                              headers={"X-AUTH-TOKEN": self.__v2_api_token}, verify=verify_ssl, params=params)
+        result = self.__get_request("/monitoring/hosts", params, verify_ssl)
         return result.json()
 
     def get_host_groups(self, search, limit: int = None, show_host: bool = None,
-                        show_service: bool = None, page: int = None, verify_ssl: bool = True):
+                        show_service: bool = None, page: int = None, verify_ssl: bool = True, sort_by=None):
         self.__check_token()
 
         params = {}
@@ -83,13 +314,15 @@ class CentreonAPIv2:
                 raise ValueError(PAGE_SUB1)
             params["page"] = page
 
-        params["search"] = search
+        if search is not None:
+            params["search"] = pcc_search.serialize_search(search)
+        if sort_by is not None:
+            params["sort_by"] = pcc_search.serialize_sort(sort_by)
 
-        result = requests.get(f"{self.__v2_server_url}/centreon/api/beta/monitoring/hostgroups",
-                              headers={"X-AUTH-TOKEN": self.__v2_api_token}, verify=verify_ssl, params=params)
+        result = self.__get_request("/monitoring/hostgroups", params, verify_ssl)
         return result.json()
 
-    def get_pollers(self, search, limit: int = None, page: int = None, verify_ssl: bool = True):
+    def get_pollers(self, search, limit: int = None, page: int = None, verify_ssl: bool = True, sort_by=None):
         self.__check_token()
 
         params = {}
@@ -100,8 +333,10 @@ class CentreonAPIv2:
                 raise ValueError(PAGE_SUB1)
             params["page"] = page
 
-        params["search"] = search
+        if search is not None:
+            params["search"] = pcc_search.serialize_search(search)
+        if sort_by is not None:
+            params["sort_by"] = pcc_search.serialize_sort(sort_by)
 
-        result = requests.get(f"{self.__v2_server_url}/centreon/api/beta/monitoring/servers",
-                              headers={"X-AUTH-TOKEN": self.__v2_api_token}, verify=verify_ssl, params=params)
+        result = self.__get_request("/monitoring/servers", params, verify_ssl)
         return result.json()
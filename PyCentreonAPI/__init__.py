@@ -1,2 +1,6 @@
 from .APIv1 import *
 from .APIv2 import *
+from .pcc_search import SearchQuery, SearchFilter, SearchGroup, SortBy, search_and, search_or
+from .pcc_journal import OperationJournal
+from .pcc_resources import MonitoringResource, CheckResult, ResourceActionResult, ResourceStatusRecord
+from .pcc_latency import HedgePolicy, deadline_scope
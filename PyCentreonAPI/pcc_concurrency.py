@@ -0,0 +1,59 @@
+import threading
+from . import pcc_exceptions
+from . import pcc_latency
+
+
+class _InFlightCall:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls
+
+    The first caller for a given key runs the function, callers arriving with the same key while it is
+    still running wait for it and receive the same result (or exception). Once the call completes the key
+    is released, so later calls always hit the server again.
+
+    A waiting caller gives up when its own deadline runs out, the call itself keeps running for the
+    other callers.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    def do(self, key, function, deadline: pcc_latency.Deadline = None):
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self.__calls[key] = call
+
+        if not leader:
+            if not call.event.wait(None if deadline is None else max(0.0, deadline.remaining())):
+                raise pcc_exceptions.CentreonTimeoutException("Deadline exceeded while waiting for an identical "
+                                                              "in-flight request!")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.event.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self.__lock:
+            return len(self.__calls)
@@ -244,3 +244,52 @@ class CentengineParameters(PrintableEnum):
     INSTANCE = "instance"
     BROKER_MODULE = "broker_module"
     NAGIOS_ACTIVATE = "nagios_activate"
+
+
+class SearchOperator(PrintableEnum):
+    EQUAL = "$eq"
+    NOT_EQUAL = "$neq"
+    LESS_THAN = "$lt"
+    LESS_EQUAL = "$le"
+    GREATER_THAN = "$gt"
+    GREATER_EQUAL = "$ge"
+    LIKE = "$lk"
+    NOT_LIKE = "$nk"
+    IN = "$in"
+    NOT_IN = "$ni"
+    REGEXP = "$rg"
+
+
+class SearchAggregator(PrintableEnum):
+    AND = "$and"
+    OR = "$or"
+
+
+class SortOrder(PrintableEnum):
+    ASC = "ASC"
+    DESC = "DESC"
+
+
+class ResourceType(PrintableEnum):
+    HOST = "host"
+    SERVICE = "service"
+    METASERVICE = "metaservice"
+
+
+class ResourceState(PrintableEnum):
+    UNHANDLED_PROBLEMS = "unhandled_problems"
+    RESOURCES_PROBLEMS = "resources_problems"
+    ACKNOWLEDGED = "acknowledged"
+    IN_DOWNTIME = "in_downtime"
+    IN_FLAPPING = "in_flapping"
+
+
+class ResourceStatus(PrintableEnum):
+    OK = "OK"
+    WARNING = "WARNING"
+    CRITICAL = "CRITICAL"
+    UNKNOWN = "UNKNOWN"
+    UP = "UP"
+    DOWN = "DOWN"
+    UNREACHABLE = "UNREACHABLE"
+    PENDING = "PENDING"
@@ -33,3 +33,14 @@ class CentreonRequestException(Exception):
         self.message = message
         super().__init__(self.message)
 
+
+class CentreonTimeoutException(Exception):
+    """Exception raised when a request times out or a deadline is exceeded
+
+    Attributes:
+        message -- explanation of the error
+    """
+
+    def __init__(self, message="Exception raised when request timed out"):
+        self.message = message
+        super().__init__(self.message)
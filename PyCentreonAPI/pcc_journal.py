@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class OperationJournal:
+    """Append-only journal of write operations, used to resume interrupted bulk runs
+
+    Each line of the journal file is a JSON record {"key": ..., "status": "ok"|"error", "ts": ..., "object": ...,
+    "action": ..., "values": ..., "detail": ...}, so failed operations can be identified from the journal.
+    An operation key is the hash of the job ID, server URL and payload, followed by the occurrence number of that
+    payload in the current run, so a job repeating the same write (add, delete, add again) journals each write
+    separately. Operations recorded with status "ok" by previous runs are loaded back when the journal is
+    reopened and reported as confirmed, so a restarted job can skip them. Operations confirmed during the
+    current run are never skipped.
+
+    A journal file belongs to one job: replaying the same job resumes it, a different job must use another
+    file or another job_id.
+
+    Writes are buffered and fsync'ed (under the journal lock) every fsync_every records or fsync_interval
+    seconds, whichever comes first. Records not yet synced when the process dies are simply replayed on the next run.
+    """
+
+    def __init__(self, path: str, job_id: str = None, fsync_every: int = 256, fsync_interval: float = 1.0,
+                 buffer_size: int = 64 * 1024):
+        if fsync_every < 1:
+            raise ValueError("fsync_every cannot be lower than 1!")
+
+        self.__path = path
+        self.__job_id = job_id
+        self.__fsync_every = fsync_every
+        self.__fsync_interval = fsync_interval
+        self.__lock = threading.Lock()
+        self.__confirmed = self.__load(path)
+        self.__file = open(path, "a", encoding="utf-8", buffering=buffer_size)
+        if self.__has_truncated_tail(path):
+            self.__file.write("\n")
+        self.__occurrences = {}
+        self.__pending = 0
+        self.__last_sync = time.monotonic()
+
+    @staticmethod
+    def __load(path: str) -> set:
+        confirmed = set()
+        if not os.path.exists(path):
+            return confirmed
+
+        with open(path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Last line may be truncated if the previous run died mid-write
+                    continue
+                # Skip lines that are valid JSON but not journal records
+                if not isinstance(record, dict) or not isinstance(record.get("key"), str):
+                    continue
+                if record.get("status") == STATUS_OK:
+                    confirmed.add(record["key"])
+        return confirmed
+
+    @staticmethod
+    def __has_truncated_tail(path: str) -> bool:
+        with open(path, "rb") as journal_file:
+            journal_file.seek(0, os.SEEK_END)
+            if journal_file.tell() == 0:
+                return False
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) != b"\n"
+
+    def operation_key(self, payload: dict, server_url: str = None) -> str:
+        """Return the key of the next occurrence of payload in the current run"""
+        identity = json.dumps({"job": self.__job_id, "server": server_url, "payload": payload}, sort_keys=True)
+        digest = hashlib.sha1(identity.encode("utf-8")).hexdigest()
+        with self.__lock:
+            occurrence = self.__occurrences.get(digest, 0) + 1
+            self.__occurrences[digest] = occurrence
+        return f"{digest}:{occurrence}"
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def is_confirmed(self, key: str) -> bool:
+        """Whether the operation was confirmed by a previous run"""
+        return key in self.__confirmed
+
+    def confirmed_count(self) -> int:
+        return len(self.__confirmed)
+
+    def record(self, key: str, success: bool, detail: str = None, payload: dict = None):
+        record = {"key": key, "status": STATUS_OK if success else STATUS_ERROR, "ts": time.time()}
+        if payload is not None:
+            for field in ("object", "action", "values"):
+                if field in payload:
+                    record[field] = payload[field]
+        if detail is not None:
+            record["detail"] = detail
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+
+        with self.__lock:
+            if self.__file.closed:
+                raise ValueError(f'Journal "{self.__path}" is closed')
+            self.__file.write(line)
+            self.__pending += 1
+            if self.__pending >= self.__fsync_every or \
+                    time.monotonic() - self.__last_sync >= self.__fsync_interval:
+                self.__file.flush()
+                os.fsync(self.__file.fileno())
+                self.__pending = 0
+                self.__last_sync = time.monotonic()
+
+    def flush(self):
+        with self.__lock:
+            if self.__file.closed:
+                return
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__pending = 0
+            self.__last_sync = time.monotonic()
+
+    def close(self):
+        with self.__lock:
+            if self.__file.closed:
+                return
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+            self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,202 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from . import pcc_exceptions
+
+_local = threading.local()
+
+
+class Deadline:
+    """Overall time budget shared by every request of an operation"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Deadline must be greater than 0!")
+        self.__expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.__expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired():
+            raise pcc_exceptions.CentreonTimeoutException("Deadline exceeded!")
+
+
+@contextmanager
+def deadline_scope(seconds: float):
+    """Apply a deadline to every request made by the current thread inside the with block
+
+    Nested scopes can only shorten the deadline, never extend it.
+    """
+    previous = current_deadline()
+    deadline = resolve_deadline(seconds)
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
+
+
+def current_deadline() -> Deadline:
+    return getattr(_local, "deadline", None)
+
+
+def resolve_deadline(seconds: float = None) -> Deadline:
+    """Deadline of an operation: the given budget, capped by the deadline scope of the current thread"""
+    current = current_deadline()
+    if seconds is None:
+        return current
+    deadline = Deadline(seconds)
+    if current is not None and current.remaining() < deadline.remaining():
+        return current
+    return deadline
+
+
+def request_timeout(timeout, deadline: Deadline = None):
+    """Return the requests timeout argument, capped by the time left before the deadline
+
+    timeout can be None, a number of seconds or a (connect, read) tuple.
+    """
+    if deadline is None:
+        return timeout
+
+    deadline.check()
+    remaining = deadline.remaining()
+    if timeout is None:
+        return remaining, remaining
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return (remaining if connect is None else min(connect, remaining),
+                remaining if read is None else min(read, remaining))
+    return min(timeout, remaining)
+
+
+class HedgePolicy:
+    """Hedged requests for idempotent reads
+
+    Once min_samples latencies have been observed, a read that has not answered after the given latency
+    percentile (at least min_delay seconds) is sent a second time, and the first successful answer is used.
+    Until then reads are sent once. The policy is thread-safe and can be shared between clients.
+
+    At most max_workers attempts run in the hedging pool. Reads that find no free slot run unhedged on the
+    caller's thread instead of queueing, and a hedge is only sent if a slot is free at that time.
+    """
+
+    def __init__(self, percentile: float = 95, min_samples: int = 20, window: int = 500, min_delay: float = 0.01,
+                 max_workers: int = 16):
+        if not 0 < percentile < 100:
+            raise ValueError("Percentile must be between 0 and 100!")
+        if min_samples < 1:
+            raise ValueError("min_samples cannot be lower than 1!")
+        if max_workers < 1:
+            raise ValueError("max_workers cannot be lower than 1!")
+
+        self.__percentile = percentile
+        self.__min_samples = min_samples
+        self.__min_delay = min_delay
+        self.__max_workers = max_workers
+        self.__samples = deque(maxlen=max(window, min_samples))
+        self.__lock = threading.Lock()
+        self.__slots = threading.BoundedSemaphore(max_workers)
+        self.__executor = None
+
+    def record(self, latency: float):
+        with self.__lock:
+            self.__samples.append(latency)
+
+    def delay(self) -> float:
+        """Latency after which a hedged request is sent, None while there are too few samples"""
+        with self.__lock:
+            if len(self.__samples) < self.__min_samples:
+                return None
+            samples = sorted(self.__samples)
+        index = max(0, math.ceil(self.__percentile / 100 * len(samples)) - 1)
+        return max(self.__min_delay, samples[index])
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers,
+                                                     thread_name_prefix="pcc-hedge")
+            return self.__executor
+
+    def __timed(self, function, started: threading.Event = None):
+        start = time.monotonic()
+        if started is not None:
+            started.set()
+        try:
+            return function()
+        finally:
+            # Failed attempts are recorded too, so that slow failures (timeouts) raise the hedge delay
+            self.record(time.monotonic() - start)
+
+    def __submit(self, executor: ThreadPoolExecutor, function, started: threading.Event = None):
+        """Run function in the pool if a slot is free, return None otherwise"""
+        if not self.__slots.acquire(blocking=False):
+            return None
+        try:
+            future = executor.submit(self.__timed, function, started)
+        except BaseException:
+            self.__slots.release()
+            raise
+        future.add_done_callback(lambda _: self.__slots.release())
+        return future
+
+    @staticmethod
+    def __remaining(deadline: Deadline, seconds: float = None) -> float:
+        if deadline is None:
+            return seconds
+        remaining = max(0.0, deadline.remaining())
+        return remaining if seconds is None else min(seconds, remaining)
+
+    def call(self, function, deadline: Deadline = None):
+        delay = self.delay()
+        if delay is None:
+            return self.__timed(function)
+
+        executor = self.__get_executor()
+        started = threading.Event()
+        first = self.__submit(executor, function, started)
+        if first is None:
+            return self.__timed(function)
+
+        # The hedge delay counts from the moment the first attempt actually starts
+        started.wait()
+        done, _ = wait([first], timeout=self.__remaining(deadline, delay))
+        if done:
+            return first.result()
+        if deadline is not None:
+            deadline.check()
+
+        pending = {first}
+        hedge = self.__submit(executor, function)
+        if hedge is not None:
+            pending.add(hedge)
+
+        error = None
+        while pending:
+            done, pending = wait(pending, timeout=self.__remaining(deadline), return_when=FIRST_COMPLETED)
+            if not done:
+                raise pcc_exceptions.CentreonTimeoutException("Deadline exceeded!")
+            for future in done:
+                exception = future.exception()
+                if exception is None:
+                    return future.result()
+                # Errors returned by Centreon are deterministic, the other attempt would fail the same way
+                if isinstance(exception, pcc_exceptions.CentreonRequestException):
+                    raise exception
+                if error is None:
+                    error = exception
+        raise error
+
+    def shutdown(self):
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,94 @@
+from collections import namedtuple
+from .pcc_enums import ResourceType
+
+
+class MonitoringResource:
+    """Host, service or meta-service targeted by an APIv2 real-time action
+
+    Services are identified by their own ID and the ID of their parent host.
+    """
+    __slots__ = ("type", "id", "parent_id")
+
+    def __init__(self, resource_type: ResourceType, resource_id: int, parent_id: int = None):
+        if not isinstance(resource_type, ResourceType):
+            raise ValueError(f"Unsupported resource type: {resource_type}")
+        if resource_type == ResourceType.SERVICE and parent_id is None:
+            raise ValueError("Service resources need the ID of their parent host")
+
+        self.type = resource_type
+        self.id = resource_id
+        self.parent_id = parent_id
+
+    @classmethod
+    def host(cls, host_id: int) -> "MonitoringResource":
+        return cls(ResourceType.HOST, host_id)
+
+    @classmethod
+    def service(cls, host_id: int, service_id: int) -> "MonitoringResource":
+        return cls(ResourceType.SERVICE, service_id, host_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "type": str(self.type),
+            "id": self.id,
+            "parent": {"id": self.parent_id} if self.parent_id is not None else None,
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, MonitoringResource) and \
+            (self.type, self.id, self.parent_id) == (other.type, other.id, other.parent_id)
+
+    def __hash__(self):
+        return hash((self.type, self.id, self.parent_id))
+
+    def __repr__(self):
+        return f"MonitoringResource({self.type}, {self.id}, parent_id={self.parent_id})"
+
+
+class CheckResult:
+    """Passive check result submitted for a monitoring resource"""
+    __slots__ = ("resource", "status", "output", "performance_data")
+
+    def __init__(self, resource: MonitoringResource, status: int, output: str, performance_data: str = None):
+        self.resource = resource
+        self.status = status
+        self.output = output
+        self.performance_data = performance_data
+
+    def to_dict(self) -> dict:
+        payload = self.resource.to_dict()
+        payload["status"] = self.status
+        payload["output"] = self.output
+        if self.performance_data is not None:
+            payload["performance_data"] = self.performance_data
+        return payload
+
+
+# Outcome of a bulk action for one resource, error is None on success
+ResourceActionResult = namedtuple("ResourceActionResult", ["resource", "success", "error"])
+
+
+# Compact real-time status of a resource, decoded from the monitoring/resources endpoint
+ResourceStatusRecord = namedtuple("ResourceStatusRecord", ["type", "id", "name", "parent_id", "parent_name",
+                                                           "status", "status_code", "severity_code",
+                                                           "acknowledged", "in_downtime", "last_check",
+                                                           "output"])
+
+
+def decode_resource_status(item: dict) -> ResourceStatusRecord:
+    parent = item.get("parent") or {}
+    status = item.get("status") or {}
+    return ResourceStatusRecord(
+        type=item.get("type"),
+        id=item.get("id"),
+        name=item.get("name"),
+        parent_id=parent.get("id"),
+        parent_name=parent.get("name"),
+        status=status.get("name"),
+        status_code=status.get("code"),
+        severity_code=status.get("severity_code"),
+        acknowledged=item.get("is_acknowledged", item.get("acknowledged")),
+        in_downtime=item.get("is_in_downtime", item.get("in_downtime")),
+        last_check=item.get("last_check"),
+        output=item.get("information"),
+    )
@@ -0,0 +1,134 @@
+import json
+from abc import ABC, abstractmethod
+from .pcc_enums import PrintableEnum, SearchOperator, SearchAggregator, SortOrder
+
+LIST_OPERATORS = (SearchOperator.IN, SearchOperator.NOT_IN)
+
+
+class SearchQuery(ABC):
+    """Base class of the APIv2 search grammar
+
+    Queries can be combined with the & and | operators, e.g.
+    SearchFilter("host.name", SearchOperator.REGEXP, "^srv") & SearchFilter("host.state", SearchOperator.EQUAL, 1)
+    """
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        pass
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def __and__(self, other: "SearchQuery") -> "SearchGroup":
+        return SearchGroup(SearchAggregator.AND, self, other)
+
+    def __or__(self, other: "SearchQuery") -> "SearchGroup":
+        return SearchGroup(SearchAggregator.OR, self, other)
+
+    def __str__(self):
+        return self.to_json()
+
+
+class SearchFilter(SearchQuery):
+    """Single condition applied to one field, serialized as {field: {operator: value}}"""
+
+    def __init__(self, field: str, operator: SearchOperator, value):
+        if not isinstance(operator, SearchOperator):
+            raise ValueError(f"Unsupported search operator: {operator}")
+        if operator in LIST_OPERATORS:
+            if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+                raise ValueError(f"Operator {operator} expects a list of values")
+            value = [self.__normalize(item) for item in value]
+        else:
+            value = self.__normalize(value)
+
+        self.field = field
+        self.operator = operator
+        self.value = value
+
+    @staticmethod
+    def __normalize(value):
+        return str(value) if isinstance(value, PrintableEnum) else value
+
+    def to_dict(self) -> dict:
+        return {self.field: {str(self.operator): self.value}}
+
+
+class SearchGroup(SearchQuery):
+    """Conditions joined by $and / $or, nested groups with the same aggregator are flattened"""
+
+    def __init__(self, aggregator: SearchAggregator, *terms: SearchQuery):
+        if not isinstance(aggregator, SearchAggregator):
+            raise ValueError(f"Unsupported search aggregator: {aggregator}")
+        if len(terms) == 0:
+            raise ValueError("Search group needs at least one term")
+
+        self.aggregator = aggregator
+        self.terms = []
+        for term in terms:
+            if not isinstance(term, SearchQuery):
+                raise ValueError(f"Search group terms must be SearchQuery instances, got {type(term).__name__}")
+            if isinstance(term, SearchGroup) and term.aggregator == aggregator:
+                self.terms.extend(term.terms)
+            else:
+                self.terms.append(term)
+
+    def to_dict(self) -> dict:
+        return {str(self.aggregator): [term.to_dict() for term in self.terms]}
+
+
+def search_and(*terms: SearchQuery) -> SearchGroup:
+    return SearchGroup(SearchAggregator.AND, *terms)
+
+
+def search_or(*terms: SearchQuery) -> SearchGroup:
+    return SearchGroup(SearchAggregator.OR, *terms)
+
+
+class SortBy:
+    """Ordered list of sort fields, serialized as {field: "ASC"|"DESC", ...}"""
+
+    def __init__(self, field: str = None, order: SortOrder = SortOrder.ASC):
+        self.fields = {}
+        if field is not None:
+            self.add(field, order)
+
+    def add(self, field: str, order: SortOrder = SortOrder.ASC) -> "SortBy":
+        if not isinstance(order, SortOrder):
+            raise ValueError(f"Unsupported sort order: {order}")
+        self.fields[field] = str(order)
+        return self
+
+    def to_dict(self) -> dict:
+        return dict(self.fields)
+
+    def to_json(self) -> str:
+        return json.dumps(self.fields, separators=(",", ":"))
+
+    def __str__(self):
+        return self.to_json()
+
+
+def serialize_search(search) -> str:
+    """Convert a search argument to the value of the "search" query parameter
+
+    SearchQuery and dict objects are serialized to JSON, strings are passed through unchanged.
+    """
+    if isinstance(search, SearchQuery):
+        return search.to_json()
+    if isinstance(search, dict):
+        return json.dumps(search, separators=(",", ":"))
+    if isinstance(search, str):
+        return search
+    raise ValueError(f"Search must be a SearchQuery, a dict or a str, got {type(search).__name__}")
+
+
+def serialize_sort(sort_by) -> str:
+    """Convert a sort argument to the value of the "sort_by" query parameter"""
+    if isinstance(sort_by, SortBy):
+        return sort_by.to_json()
+    if isinstance(sort_by, dict):
+        return json.dumps({field: str(order) for field, order in sort_by.items()}, separators=(",", ":"))
+    if isinstance(sort_by, str):
+        return sort_by
+    raise ValueError(f"Sort must be a SortBy, a dict or a str, got {type(sort_by).__name__}")
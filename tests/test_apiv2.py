@@ -0,0 +1,57 @@
+import json
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+import requests
+
+from PyCentreonAPI import CentreonAPIv2
+from PyCentreonAPI.pcc_enums import ResourceType, ResourceState
+
+
+class FakeResponse:
+    def __init__(self, body: dict, status_code: int = 200):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode("utf-8")
+        self.__body = body
+
+    def json(self):
+        return self.__body
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(requests, "head", lambda *args, **kwargs: FakeResponse({}))
+    monkeypatch.setattr(requests, "post",
+                        lambda *args, **kwargs: FakeResponse({"security": {"token": "token"}}))
+    client = CentreonAPIv2("https://centreon.example.com")
+    client.authenticate("user", "password")
+    return client
+
+
+def test_resource_status_filters_are_json_arrays(api, monkeypatch):
+    urls = []
+
+    def fake_get(url, params=None, **kwargs):
+        urls.append(requests.Request("GET", url, params=params).prepare().url)
+        return FakeResponse({"result": [{"type": "service", "id": 2, "name": "cpu",
+                                         "parent": {"id": 1, "name": "srv01"},
+                                         "status": {"code": 2, "name": "CRITICAL", "severity_code": 1},
+                                         "information": "CPU 99%"}],
+                             "meta": {"page": 1, "limit": 10, "total": 1}})
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    records = api.get_resource_status(types=[ResourceType.SERVICE], states=ResourceState.UNHANDLED_PROBLEMS,
+                                      hostgroups=["HG"], pollers=["Central"], limit=10)
+
+    assert len(urls) == 1
+    query = parse_qs(urlsplit(urls[0]).query)
+    assert query["types"] == ['["service"]']
+    assert query["states"] == ['["unhandled_problems"]']
+    assert query["hostgroup_names"] == ['["HG"]']
+    assert query["monitoring_server_names"] == ['["Central"]']
+    assert "statuses" not in query
+    assert not any(key.endswith("[]") for key in query)
+
+    assert records[0].parent_name == "srv01"
+    assert records[0].status == "CRITICAL"
+    assert records[0].output == "CPU 99%"
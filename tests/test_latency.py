@@ -0,0 +1,69 @@
+import itertools
+import threading
+import time
+
+import pytest
+
+from PyCentreonAPI import HedgePolicy, pcc_exceptions
+
+
+def warm_up(policy: HedgePolicy, latency: float, samples: int = 20):
+    for _ in range(samples):
+        policy.record(latency)
+
+
+def test_concurrent_reads_are_not_queued_nor_hedged():
+    policy = HedgePolicy(max_workers=16)
+    warm_up(policy, 0.2)
+    calls = itertools.count()
+
+    def read():
+        next(calls)
+        time.sleep(0.1)
+        return True
+
+    threads = [threading.Thread(target=policy.call, args=(read,)) for _ in range(64)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    policy.shutdown()
+
+    assert next(calls) == 64
+    assert elapsed < 0.3
+
+
+def test_slow_read_is_hedged():
+    policy = HedgePolicy()
+    warm_up(policy, 0.05)
+    calls = itertools.count()
+
+    def read():
+        attempt = next(calls)
+        time.sleep(1.0 if attempt == 0 else 0.01)
+        return attempt
+
+    start = time.monotonic()
+    assert policy.call(read) == 1
+    assert time.monotonic() - start < 0.5
+    policy.shutdown()
+
+
+def test_request_error_is_not_retried_by_hedge():
+    policy = HedgePolicy()
+    warm_up(policy, 0.05)
+    calls = itertools.count()
+
+    def read():
+        if next(calls) == 0:
+            time.sleep(0.1)
+            raise pcc_exceptions.CentreonRequestException("[HTTP Response 404] Object not found")
+        time.sleep(1.0)
+
+    start = time.monotonic()
+    with pytest.raises(pcc_exceptions.CentreonRequestException):
+        policy.call(read)
+    assert time.monotonic() - start < 0.5
+    policy.shutdown()